@@ -1,10 +1,56 @@
+import csv
+import io
+import threading
+import weakref
 import psycopg2
 from psycopg2 import sql
-from psycopg2.extras import DictCursor
+from psycopg2.extras import execute_values
+from psycopg2.pool import ThreadedConnectionPool
 from typing import Optional, Dict, List
 
+try:
+    import psycopg  # psycopg 3, used for pipelined inserts
+except ImportError:
+    psycopg = None
+
 class CleanedDataToDatabase:
-    def __init__(self, dbname: str, username: str, password: str, host: str = "localhost", port: str = "5432"):
+    """
+    Load cleaned review data into PostgreSQL.
+
+    Connections come from a pool owned by the instance and are held per
+    thread, so several threads can share one instance and each works on its
+    own pooled connection. Used as a context manager, the entering thread
+    keeps one connection and cursor for the whole block so repeated batch
+    inserts skip the connect/authenticate handshake; leaving the block closes
+    the pool and any psycopg 3 connection once no other thread still holds a
+    pooled connection:
+
+        with CleanedDataToDatabase(dbname, user, password) as db:
+            for batch in batches:
+                db.batch_insert_reviews(batch)
+
+    Outside a ``with`` block every method borrows a pooled connection and
+    hands it back when done; call ``close()`` once finished to release the
+    pool's sockets.
+
+    With ``use_psycopg3=True`` the bulk insert methods run executemany
+    through a psycopg 3 pipeline instead, which sends every row before
+    waiting for the server (a single sync per batch).
+    """
+
+    def __init__(
+        self,
+        dbname: str,
+        username: str,
+        password: str,
+        host: str = "localhost",
+        port: str = "5432",
+        min_connections: int = 1,
+        max_connections: int = 8,
+        use_psycopg3: bool = False
+    ):
+        if use_psycopg3 and psycopg is None:
+            raise ImportError("use_psycopg3=True requires the psycopg package (psycopg 3)")
         self.connection_params = {
             'dbname': dbname,
             'user': username,
@@ -12,27 +58,162 @@ class CleanedDataToDatabase:
             'host': host,
             'port': port
         }
-        self.connection = None
-        self.cursor = None
+        self.min_connections = min_connections
+        self.max_connections = max_connections
+        self._local = threading.local()
+        self._pool = None
+        # Guards creating/closing the pool and the count of borrowed connections
+        self._pool_lock = threading.RLock()
+        self._borrowed = 0
+        # Keyed on the connection object itself: the pool may close a returned
+        # connection and a new one can then reuse its id()
+        self._prepared_connections = weakref.WeakSet()
+        self.use_psycopg3 = use_psycopg3
+        self._pipeline_connection = None
+        self._pipeline_lock = threading.Lock()
+
+    @property
+    def connection(self):
+        """Connection held by the calling thread, if any"""
+        return getattr(self._local, 'connection', None)
+
+    @connection.setter
+    def connection(self, value) -> None:
+        self._local.connection = value
+
+    @property
+    def cursor(self):
+        """Cursor held by the calling thread, if any"""
+        return getattr(self._local, 'cursor', None)
+
+    @cursor.setter
+    def cursor(self, value) -> None:
+        self._local.cursor = value
+
+    @property
+    def _in_context(self) -> bool:
+        return getattr(self._local, 'in_context', False)
+
+    @_in_context.setter
+    def _in_context(self, value: bool) -> None:
+        self._local.in_context = value
+
+    def __enter__(self) -> "CleanedDataToDatabase":
+        self._create_connection()
+        self._in_context = True
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self._in_context = False
+        self._close_connection()
+        with self._pool_lock:
+            # Other threads may still be working on connections from the pool
+            if self._borrowed == 0:
+                self.close()
+
+    def _get_pool(self) -> ThreadedConnectionPool:
+        """Create the connection pool on first use"""
+        if self._pool is None:
+            self._pool = ThreadedConnectionPool(
+                self.min_connections,
+                self.max_connections,
+                **self.connection_params
+            )
+        return self._pool
 
     def _create_connection(self) -> None:
-        """Establish database connection with error handling"""
+        """Borrow a pooled connection unless one is already held"""
+        if self.connection is not None:
+            return
         try:
-            self.connection = psycopg2.connect(**self.connection_params)
+            with self._pool_lock:
+                pool = self._get_pool()
+                self.connection = pool.getconn()
+                self._borrowed += 1
+            # Remember the pool, which close() may have replaced by return time
+            self._local.pool = pool
             self.connection.autocommit = False  # Use transactions explicitly
-            self.cursor = self.connection.cursor(cursor_factory=DictCursor)
+            # Plain tuple cursor: the write paths never need rows as dicts
+            self.cursor = self.connection.cursor()
             print("Successfully connected to database")
         except psycopg2.Error as e:
             raise ConnectionError(f"Database connection failed: {e}")
 
+    def _prepare_statements(self) -> None:
+        """PREPARE the single-review insert once per pooled connection"""
+        if self.connection in self._prepared_connections:
+            return
+        self.cursor.execute("""
+        PREPARE insert_review (VARCHAR, VARCHAR, VARCHAR, VARCHAR, TEXT, NUMERIC, INTEGER) AS
+        INSERT INTO Reviews (review_id, app_id, app_name, user_name, review, rating, thumbs_up_count)
+        VALUES ($1, $2, $3, $4, $5, $6, $7)
+        ON CONFLICT (review_id) DO NOTHING;
+        """)
+        self.connection.commit()
+        self._prepared_connections.add(self.connection)
+
     def _close_connection(self) -> None:
-        """Safely close database connection"""
+        """Return the connection to the pool, unless held by a with block"""
+        if self._in_context:
+            return
         if self.cursor:
             self.cursor.close()
+            self.cursor = None
         if self.connection:
-            self.connection.close()
+            pool = getattr(self._local, 'pool', None)
+            with self._pool_lock:
+                if pool is not None and pool is self._pool:
+                    self._pool.putconn(self.connection)
+                    self._borrowed -= 1
+                else:
+                    # The pool was closed (and maybe recreated) meanwhile
+                    self.connection.close()
+            self.connection = None
+            self._local.pool = None
         print("Connection closed")
 
+    def close(self) -> None:
+        """Close every pooled connection and the psycopg 3 connection"""
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.closeall()
+                self._pool = None
+                self._borrowed = 0
+                self._prepared_connections.clear()
+        with self._pipeline_lock:
+            if self._pipeline_connection is not None:
+                self._pipeline_connection.close()
+                self._pipeline_connection = None
+
+    def _pipeline_executemany(self, insert_sql: str, records: List[tuple]) -> int:
+        """Run executemany in psycopg 3 pipeline mode and commit once"""
+        # One psycopg 3 connection is shared, so batches from different
+        # threads must not interleave inside its transaction
+        with self._pipeline_lock:
+            return self._pipeline_executemany_locked(insert_sql, records)
+
+    def _pipeline_executemany_locked(self, insert_sql: str, records: List[tuple]) -> int:
+        try:
+            if self._pipeline_connection is None or self._pipeline_connection.closed:
+                self._pipeline_connection = psycopg.connect(**self.connection_params)
+        except psycopg.Error as e:
+            raise ConnectionError(f"Database connection failed: {e}")
+
+        connection = self._pipeline_connection
+        try:
+            # The cursor must outlive the pipeline: closing it resets rowcount,
+            # and the results are only fetched when the pipeline syncs on exit
+            with connection.cursor() as cursor:
+                with connection.pipeline():
+                    cursor.executemany(insert_sql, records)
+                # executemany reports the total rows affected across all rows
+                inserted = cursor.rowcount
+            connection.commit()
+            return inserted
+        except psycopg.Error as e:
+            connection.rollback()
+            raise RuntimeError(f"Pipelined insert failed: {e}")
+
     def create_reviews_table(self) -> None:
         """Create the Reviews table if it doesn't exist"""
         create_table_sql = """
@@ -62,12 +243,14 @@ class CleanedDataToDatabase:
     def insert_review(self, review_data: Dict) -> bool:
         """Insert a single review record"""
         insert_sql = """
-        INSERT INTO Reviews (review_id, app_id, app_name, user_name, review, rating, thumbs_up_count)
-        VALUES (%(review_id)s, %(app_id)s, %(app_name)s, %(user_name)s, %(review)s, %(rating)s, %(thumbs_up_count)s)
-        ON CONFLICT (review_id) DO NOTHING;
+        EXECUTE insert_review (
+            %(review_id)s, %(app_id)s, %(app_name)s, %(user_name)s,
+            %(review)s, %(rating)s, %(thumbs_up_count)s
+        );
         """
         try:
             self._create_connection()
+            self._prepare_statements()
             self.cursor.execute(insert_sql, review_data)
             self.connection.commit()
             return self.cursor.rowcount > 0
@@ -77,48 +260,125 @@ class CleanedDataToDatabase:
         finally:
             self._close_connection()
 
-    def batch_insert_reviews(self, reviews: List[Dict]) -> int:
-        """Insert multiple reviews efficiently"""
+    def batch_insert_reviews(self, reviews: List[Dict], page_size: int = 1000) -> int:
+        """Insert multiple reviews efficiently using multi-row VALUES statements"""
         insert_sql = """
         INSERT INTO Reviews (review_id, app_id, app_name, user_name, review, rating, thumbs_up_count)
-        VALUES (%s, %s, %s, %s, %s, %s, %s)
-        ON CONFLICT (review_id) DO NOTHING;
+        VALUES %s
+        ON CONFLICT (review_id) DO NOTHING
+        RETURNING review_id;
         """
+        records = [
+            (r['review_id'], r['app_id'], r['app_name'], 
+             r.get('user_name'), r.get('review'), r['rating'], 
+             r.get('thumbs_up_count', 0))
+            for r in reviews
+        ]
+        if self.use_psycopg3:
+            return self._pipeline_executemany("""
+            INSERT INTO Reviews (review_id, app_id, app_name, user_name, review, rating, thumbs_up_count)
+            VALUES (%s, %s, %s, %s, %s, %s, %s)
+            ON CONFLICT (review_id) DO NOTHING;
+            """, records)
         try:
             self._create_connection()
-            records = [
-                (r['review_id'], r['app_id'], r['app_name'], 
-                 r.get('user_name'), r.get('review'), r['rating'], 
-                 r.get('thumbs_up_count', 0))
-                for r in reviews
-            ]
-            self.cursor.executemany(insert_sql, records)
+            # rowcount only reflects the last page, so count the returned keys instead
+            inserted = execute_values(
+                self.cursor,
+                insert_sql,
+                records,
+                template="(%s, %s, %s, %s, %s, %s, %s)",
+                page_size=page_size,
+                fetch=True
+            )
             self.connection.commit()
-            return self.cursor.rowcount
+            return len(inserted)
         except psycopg2.Error as e:
             self.connection.rollback()
             raise RuntimeError(f"Batch insert failed: {e}")
         finally:
             self._close_connection()
+
+    def copy_insert_reviews(self, reviews: List[Dict]) -> int:
+        """
+        Bulk load reviews through COPY into a staging table.
+
+        Rows are streamed as CSV, then moved into Reviews with
+        ON CONFLICT DO NOTHING so duplicates are skipped as in
+        batch_insert_reviews. Empty strings are loaded as NULL.
+        """
+        staging_sql = """
+        CREATE TEMP TABLE reviews_staging
+        (LIKE Reviews INCLUDING DEFAULTS)
+        ON COMMIT DROP;
+        """
+        copy_sql = """
+        COPY reviews_staging (review_id, app_id, app_name, user_name, review, rating, thumbs_up_count)
+        FROM STDIN WITH CSV
+        """
+        merge_sql = """
+        INSERT INTO Reviews (review_id, app_id, app_name, user_name, review, rating, thumbs_up_count)
+        SELECT review_id, app_id, app_name, user_name, review, rating, thumbs_up_count
+        FROM reviews_staging
+        ON CONFLICT (review_id) DO NOTHING;
+        """
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for r in reviews:
+            writer.writerow((
+                r['review_id'], r['app_id'], r['app_name'],
+                r.get('user_name'), r.get('review'), r['rating'],
+                r.get('thumbs_up_count', 0)
+            ))
+        buffer.seek(0)
+
+        try:
+            self._create_connection()
+            self.cursor.execute(staging_sql)
+            self.cursor.copy_expert(copy_sql, buffer)
+            self.cursor.execute(merge_sql)
+            inserted = self.cursor.rowcount
+            self.connection.commit()
+            return inserted
+        except psycopg2.Error as e:
+            self.connection.rollback()
+            raise RuntimeError(f"COPY insert failed: {e}")
+        finally:
+            self._close_connection()
             
     def insert_banks(self, banks_data: List[Dict]) -> int:
         """Insert multiple banks"""
         insert_sql = """
         INSERT INTO banks (bank_id, bank_name, website_url, app_store_id)
-        VALUES (%s, %s, %s, %s)
-        ON CONFLICT (bank_id) DO NOTHING;
+        VALUES %s
+        ON CONFLICT (bank_id) DO NOTHING
+        RETURNING bank_id;
         """
+        data = [
+            (bank['bank_id'], bank['bank_name'], 
+            bank['website_url'], bank['app_store_id'])
+            for bank in banks_data
+        ]
+        if self.use_psycopg3:
+            inserted = self._pipeline_executemany("""
+            INSERT INTO banks (bank_id, bank_name, website_url, app_store_id)
+            VALUES (%s, %s, %s, %s)
+            ON CONFLICT (bank_id) DO NOTHING;
+            """, data)
+            print(f"Inserted/updated {inserted} banks")
+            return inserted
         try:
             self._create_connection()
-            data = [
-                (bank['bank_id'], bank['bank_name'], 
-                bank['website_url'], bank['app_store_id'])
-                for bank in banks_data
-            ]
-            self.cursor.executemany(insert_sql, data)
+            inserted = execute_values(
+                self.cursor,
+                insert_sql,
+                data,
+                template="(%s, %s, %s, %s)",
+                fetch=True
+            )
             self.connection.commit()
-            print(f"Inserted/updated {self.cursor.rowcount} banks")
-            return self.cursor.rowcount
+            print(f"Inserted/updated {len(inserted)} banks")
+            return len(inserted)
         except Exception as e:
             self.connection.rollback()
             raise RuntimeError(f"Bank insert failed: {str(e)}")
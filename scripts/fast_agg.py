@@ -0,0 +1,86 @@
+"""
+Grouped reductions over integer group codes.
+
+The kernels are JIT-compiled with numba when it is installed and the input
+is large enough to repay the threading overhead; otherwise the same results
+are computed with numpy's bincount. Compiled kernels are cached on disk, so
+only the first process pays the compile time.
+"""
+import numpy as np
+from typing import Tuple
+
+try:
+    from numba import njit, prange, get_num_threads
+except ImportError:
+    njit = None
+
+# Below this many rows np.bincount beats the threaded kernel
+_JIT_MIN_ROWS = 1_000_000
+
+
+def _bincount_sum_count(group_ids, values, n_groups):
+    sums = np.bincount(group_ids, weights=values, minlength=n_groups)
+    counts = np.bincount(group_ids, minlength=n_groups)
+    return sums, counts
+
+
+if njit is not None:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _group_sum_count(group_ids, values, n_groups):
+        # Each thread accumulates into its own row so the scatter adds don't race
+        n_threads = get_num_threads()
+        chunk = (group_ids.size + n_threads - 1) // n_threads
+        partial_sums = np.zeros((n_threads, n_groups), dtype=np.float64)
+        partial_counts = np.zeros((n_threads, n_groups), dtype=np.int64)
+        for t in prange(n_threads):
+            start = t * chunk
+            stop = min(start + chunk, group_ids.size)
+            for i in range(start, stop):
+                g = group_ids[i]
+                partial_sums[t, g] += values[i]
+                partial_counts[t, g] += 1
+
+        sums = np.zeros(n_groups, dtype=np.float64)
+        counts = np.zeros(n_groups, dtype=np.int64)
+        for t in range(n_threads):
+            for g in range(n_groups):
+                sums[g] += partial_sums[t, g]
+                counts[g] += partial_counts[t, g]
+        return sums, counts
+else:
+    _group_sum_count = None
+
+
+def group_count_mean(
+    group_ids: np.ndarray,
+    values: np.ndarray,
+    n_groups: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Count and average values per group, skipping NaN values and negative
+    (missing) group codes like pandas groupby does.
+
+    Args:
+        group_ids: Integer group code per row (e.g. Categorical codes)
+        values: Numeric value per row
+        n_groups: Number of groups
+
+    Returns:
+        Tuple of (counts, means); groups without values have a NaN mean
+    """
+    group_ids = np.asarray(group_ids, dtype=np.int32)
+    values = np.asarray(values, dtype=np.float32)
+    valid = (group_ids >= 0) & ~np.isnan(values)
+    group_ids, values = group_ids[valid], values[valid]
+    if _group_sum_count is not None and group_ids.size >= _JIT_MIN_ROWS:
+        sums, counts = _group_sum_count(group_ids, values, n_groups)
+    else:
+        sums, counts = _bincount_sum_count(group_ids, values, n_groups)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = sums / counts
+    return counts, means
+
+
+def group_mean(group_ids: np.ndarray, values: np.ndarray, n_groups: int) -> np.ndarray:
+    """Average values per group; see group_count_mean"""
+    return group_count_mean(group_ids, values, n_groups)[1]
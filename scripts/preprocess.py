@@ -1,17 +1,46 @@
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
 from typing import List, Optional
 import os
 from datetime import datetime
 
+try:
+    import fasttext
+except ImportError:
+    fasttext = None
+
+# Explicit Arrow types for the numeric/date columns written by ScrapeReview
+_RAW_COLUMN_TYPES = {
+    'score': pa.int8(),
+    'thumbsUpCount': pa.int32(),
+    'at': pa.timestamp('us')
+}
+
+# fastText language-ID models, loaded once per path
+_LID_MODELS = {}
+
+
+def _load_lid_model(path: str):
+    """Load (and cache) a fastText language-ID model such as lid.176.ftz"""
+    if path not in _LID_MODELS:
+        if fasttext is None:
+            raise ImportError("Language detection with lid_model_path requires the fasttext package")
+        _LID_MODELS[path] = fasttext.load_model(path)
+    return _LID_MODELS[path]
+
 class DataPreprocessor:
     """
     Enhanced class to preprocess and clean scraped Google Play Store review data.
     
     Args:
-        input_file (str): Path to input CSV file
+        input_file (str): Path to input CSV or Parquet file
         output_file (str): Path to save cleaned data
         save (bool): Whether to save cleaned data (default: True)
         verbose (bool): Whether to print progress messages (default: True)
+        lid_model_path (str): Optional fastText language-ID model (e.g. lid.176.ftz).
+            When given, reviews not labelled English are dropped during preprocessing
     """
     
     def __init__(
@@ -19,12 +48,14 @@ class DataPreprocessor:
         input_file: str, 
         output_file: str, 
         save: bool = True,
-        verbose: bool = True
+        verbose: bool = True,
+        lid_model_path: Optional[str] = None
     ):
         self.input_file = input_file
         self.output_file = output_file
         self.save = save
         self.verbose = verbose
+        self.lid_model_path = lid_model_path
         
         # Validate input file exists
         self._validate_input_file()
@@ -56,14 +87,17 @@ class DataPreprocessor:
     
     def _load_data(self) -> pd.DataFrame:
         """
-        Load data from CSV file with robust error handling.
+        Load data from a CSV or Parquet file with robust error handling.
         
         Returns:
             pd.DataFrame: Loaded data or empty DataFrame on error
         """
         try:
             self._print(f"Loading data from {self.input_file}")
-            data = pd.read_csv(self.input_file)
+            if self.input_file.endswith(".parquet"):
+                data = pd.read_parquet(self.input_file)
+            else:
+                data = self._read_csv()
             
             if data.empty:
                 self._print("Warning: Loaded an empty DataFrame")
@@ -79,6 +113,24 @@ class DataPreprocessor:
             self._print(f"Error loading data: {str(e)}")
             return pd.DataFrame()
     
+    def _read_csv(self) -> pd.DataFrame:
+        """
+        Read the CSV with Arrow's multithreaded parser, falling back to
+        pandas when Arrow cannot parse the file with the expected types.
+        
+        Returns:
+            pd.DataFrame: Loaded data
+        """
+        convert_options = pacsv.ConvertOptions(
+            column_types=_RAW_COLUMN_TYPES,
+            strings_can_be_null=True  # Treat empty strings as missing, like pandas
+        )
+        try:
+            table = pacsv.read_csv(self.input_file, convert_options=convert_options)
+        except pa.ArrowInvalid:
+            return pd.read_csv(self.input_file)
+        return table.to_pandas()
+    
     def _preprocess(self) -> pd.DataFrame:
         """
         Clean and transform the data with comprehensive preprocessing.
@@ -97,16 +149,21 @@ class DataPreprocessor:
             # Record initial stats
             initial_count = len(data_frame)
             
-            # 1. Handle missing values
-            data_frame.dropna(inplace=True)
-            missing_dropped = initial_count - len(data_frame)
-            self._print(f"Dropped {missing_dropped} records with missing values")
-            
-            # 2. Remove duplicates
-            data_frame.drop_duplicates(inplace=True)
-            duplicates_dropped = initial_count - missing_dropped - len(data_frame)
+            # 1. Remove duplicates (by review ID alone when available,
+            #    so the long review text is never hashed)
+            dedup_subset = ['reviewId'] if 'reviewId' in data_frame.columns else None
+            data_frame.drop_duplicates(subset=dedup_subset, keep='first', inplace=True)
+            duplicates_dropped = initial_count - len(data_frame)
             self._print(f"Dropped {duplicates_dropped} duplicate records")
             
+            # 2. Handle missing values in the required columns
+            required_columns = [
+                c for c in ['reviewId', 'content', 'score', 'at', 'app_id'] if c in data_frame.columns
+            ]
+            data_frame.dropna(subset=required_columns or None, inplace=True)
+            missing_dropped = initial_count - duplicates_dropped - len(data_frame)
+            self._print(f"Dropped {missing_dropped} records with missing values")
+            
             # 3. Normalize dates with better format handling
             data_frame['at'] = pd.to_datetime(
                 data_frame['at'], 
@@ -140,19 +197,35 @@ class DataPreprocessor:
             )
             
             # 5. Extract and clean app names
-            data_frame['app_name'] = data_frame['app_id'].apply(
-                lambda x: x.split('.')[-2].title() if isinstance(x, str) else 'Unknown'
+            data_frame['app_name'] = (
+                data_frame['app_id']
+                .str.split('.')
+                .str[-2]
+                .str.title()
+                .fillna('Unknown')
             )
             
             # 6. Clean text data
             if 'review' in data_frame.columns:
-                data_frame['review'] = (
-                    data_frame['review']
-                    .str.strip()
-                    .replace(r'\s+', ' ', regex=True)
+                # Splitting on whitespace also trims leading/trailing space
+                data_frame['review'] = data_frame['review'].str.split().str.join(' ')
+            
+            # 6b. Keep only English reviews when a language-ID model is given
+            if self.lid_model_path:
+                data_frame = self._filter_english_content(data_frame)
+            
+            # 7. Store text and dates in Arrow-backed columns (flat buffers
+            #    instead of one Python object per cell)
+            for col in ['review_id', 'app_id', 'app_name', 'user_name', 'review', 'developer_reply']:
+                if col in data_frame.columns:
+                    data_frame[col] = data_frame[col].astype('string[pyarrow]')
+            if 'date' in data_frame.columns:
+                tz = data_frame['date'].dt.tz
+                data_frame['date'] = data_frame['date'].astype(
+                    pd.ArrowDtype(pa.timestamp('us', tz=str(tz) if tz else None))
                 )
             
-            # 7. Select final features (only those available)
+            # 8. Select final features (only those available)
             possible_features = [
                 "review_id", 'app_id', 'app_name', 'user_name', 'review', 'rating',
                 'thumbs_up_count', 'date', 'developer_reply', 'developer_reply_date'
@@ -196,9 +269,41 @@ class DataPreprocessor:
         if 'review' not in data_frame.columns:
             return data_frame
         
-        # Simple heuristic to filter English content
-        is_english = data_frame['review'].str.contains(r'^[\x00-\x7F]+$', na=False)
+        reviews = data_frame['review'].to_numpy(dtype=object)
+        if self.lid_model_path:
+            is_english = self._detect_english(reviews)
+        else:
+            # Simple heuristic to filter English content: non-empty, ASCII-only text
+            is_english = np.fromiter(
+                (isinstance(s, str) and len(s) > 0 and s.isascii() for s in reviews),
+                dtype=bool,
+                count=len(reviews)
+            )
         filtered_data = data_frame[is_english]
         
         self._print(f"Filtered down to {len(filtered_data)} English reviews")
-        return filtered_data
\ No newline at end of file
+        return filtered_data
+    
+    def _detect_english(self, reviews: np.ndarray) -> np.ndarray:
+        """
+        Identify English reviews with the fastText language-ID model.
+        
+        Args:
+            reviews (np.ndarray): Review texts (missing values allowed)
+        
+        Returns:
+            np.ndarray: Boolean mask of reviews labelled English
+        """
+        model = _load_lid_model(self.lid_model_path)
+        has_text = np.fromiter(
+            (isinstance(s, str) and len(s) > 0 for s in reviews),
+            dtype=bool,
+            count=len(reviews)
+        )
+        is_english = np.zeros(len(reviews), dtype=bool)
+        if has_text.any():
+            # fastText rejects newlines; the first 200 characters identify the language
+            texts = [s[:200].replace('\n', ' ') for s in reviews[has_text]]
+            labels, _ = model.predict(texts, k=1)
+            is_english[has_text] = [label[0] == '__label__en' for label in labels]
+        return is_english
\ No newline at end of file
@@ -3,10 +3,47 @@ import pandas as pd
 from typing import List, Dict
 import os
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from tqdm import tqdm
 import json
 
 
+class _RateLimiter:
+    """
+    Token bucket shared by the scraping threads.
+    
+    Args:
+        interval: Seconds needed to refill one token
+        capacity: Maximum number of requests allowed in a burst
+    """
+    
+    def __init__(self, interval: float, capacity: int = 1):
+        self.interval = interval
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self) -> None:
+        """Block until a token is available, then consume it"""
+        if self.interval <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity,
+                    self._tokens + (now - self._last_refill) / self.interval
+                )
+                self._last_refill = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) * self.interval
+            time.sleep(wait)
+
+
 class ScrapeReview:
     def __init__(
         self,
@@ -15,7 +52,9 @@ class ScrapeReview:
         output_dir: str = "../data",
         scrape_metadata: bool = False,
         max_retries: int = 3,
-        delay: float = 2.0
+        delay: float = 2.0,
+        save_json: bool = False,
+        max_workers: int = 8
     ):
         """
         Initialize the ScrapeReview instance.
@@ -26,7 +65,9 @@ class ScrapeReview:
             output_dir: Directory to save the data
             scrape_metadata: Whether to scrape app metadata
             max_retries: Maximum number of retries for failed requests
-            delay: Delay between requests in seconds
+            delay: Minimum delay between requests in seconds, shared by all workers
+            save_json: Whether to also write the reviews as indented JSON
+            max_workers: Number of apps scraped concurrently
         """
         self.app_ids = app_ids
         self.save = save
@@ -34,7 +75,10 @@ class ScrapeReview:
         self.scrape_metadata = scrape_metadata
         self.max_retries = max_retries
         self.delay = delay
+        self.save_json = save_json
+        self.max_workers = max_workers
         self.metadata = {}
+        self._rate_limiter = _RateLimiter(delay)
         
         if self.save:
             os.makedirs(self.output_dir, exist_ok=True)
@@ -72,6 +116,7 @@ class ScrapeReview:
         
         while attempts < self.max_retries:
             try:
+                self._rate_limiter.acquire()
                 result, _ = reviews(
                     app_id=app_id,
                     country=country,
@@ -112,41 +157,48 @@ class ScrapeReview:
         Returns:
             Combined DataFrame of all reviews
         """
-        all_data = pd.DataFrame()
-        
         if not self.app_ids:
             print("Warning: No app IDs provided")
-            return all_data
+            return pd.DataFrame()
         
         print(f"Scraping reviews for {len(self.app_ids)} apps...")
         
-        for app_id in tqdm(self.app_ids, desc="Scraping apps"):
-            df = self._scrape_single_app(
-                app_id=app_id,
-                count=count,
-                country=country,
-                lang=lang,
-                sort=sort,
-            )
-            
-            if not df.empty:
-                all_data = pd.concat([all_data, df], ignore_index=True)
-            else:
-                print(f"No reviews scraped for {app_id}")
-            
-            time.sleep(self.delay)
+        # Apps are scraped concurrently; the shared rate limiter spaces out requests
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                executor.submit(
+                    self._scrape_single_app,
+                    app_id=app_id,
+                    count=count,
+                    country=country,
+                    lang=lang,
+                    sort=sort,
+                ): app_id
+                for app_id in self.app_ids
+            }
+            results = {}
+            for future in tqdm(as_completed(futures), total=len(futures), desc="Scraping apps"):
+                app_id = futures[future]
+                results[app_id] = future.result()
+                if results[app_id].empty:
+                    print(f"No reviews scraped for {app_id}")
+        
+        # Concatenate once, in the original app order, to avoid quadratic copying
+        dfs = [results[app_id] for app_id in self.app_ids if not results[app_id].empty]
+        all_data = pd.concat(dfs, ignore_index=True) if dfs else pd.DataFrame()
         
         if self.save and not all_data.empty:
-            filename = "raw_reviews.csv"
-            filepath = os.path.join(self.output_dir, filename)
+            columns = ['reviewId', 'userName', 'content', 'score', 'thumbsUpCount', 'at', 'app_id']
+            filepath = os.path.join(self.output_dir, "raw_reviews.parquet")
             
             try:
-                all_data[['reviewId', 'userName', 'content', 'score', 'thumbsUpCount', 'at', 'app_id']].to_csv(filepath, index=False)
+                all_data[columns].to_parquet(filepath, index=False, compression="zstd")
                 print(f"Data saved to {filepath}")
                 
-                json_filepath = os.path.join(self.output_dir, "raw_reviews.json")
-                all_data[['reviewId', 'userName', 'content', 'score', 'thumbsUpCount', 'at', 'app_id']].to_json(json_filepath, orient="records", indent=4)
-                print(f"Data also saved as JSON to {json_filepath}")
+                if self.save_json:
+                    json_filepath = os.path.join(self.output_dir, "raw_reviews.json")
+                    all_data[columns].to_json(json_filepath, orient="records", indent=4)
+                    print(f"Data also saved as JSON to {json_filepath}")
                 
             except Exception as e:
                 print(f"Error saving data: {str(e)}")
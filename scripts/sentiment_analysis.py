@@ -1,12 +1,16 @@
 from dotenv import load_dotenv
 import os
+import torch
 from transformers import pipeline, AutoTokenizer, AutoModelForSequenceClassification
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Union
 import requests
 
 # Load environment variables
 load_dotenv()
 
+# Repository root, so default model paths don't depend on the working directory
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
 class SentimentAnalyzer:
     """
     A sentiment analysis class using DistilBERT model with Hugging Face transformers.
@@ -14,7 +18,9 @@ class SentimentAnalyzer:
     """
     
     def __init__(self, model_name: str = "distilbert-base-uncased-finetuned-sst-2-english",
-                 use_api: bool = False, neutral_threshold: float = 0.2):
+                 use_api: bool = False, neutral_threshold: float = 0.2,
+                 quantize: bool = False, quantized_model_dir: Optional[str] = None,
+                 compile_model: bool = False):
         """
         Initialize the sentiment analyzer.
         
@@ -22,10 +28,21 @@ class SentimentAnalyzer:
             model_name: Name of the pre-trained model
             use_api: Whether to use Hugging Face API instead of local model
             neutral_threshold: Threshold for neutral classification (0-0.5)
+            quantize: Serve an int8 ONNX Runtime export of the model on CPU
+                (requires optimum[onnxruntime])
+            quantized_model_dir: Where the quantized model is saved and reused
+                (default: models/<model_name>-int8 under the repository root)
+            compile_model: Compile the PyTorch model with torch.compile
+                (ignored for the quantized ONNX model)
         """
         self.model_name = model_name
         self.use_api = use_api
         self.neutral_threshold = neutral_threshold
+        self.quantize = quantize
+        self.quantized_model_dir = quantized_model_dir or os.path.join(
+            _REPO_ROOT, "models", f"{model_name.split('/')[-1]}-int8"
+        )
+        self.compile_model = compile_model
         
         if not use_api:
             self._initialize_local_model()
@@ -35,16 +52,65 @@ class SentimentAnalyzer:
     def _initialize_local_model(self) -> None:
         """Initialize the local model and tokenizer"""
         try:
+            # The int8 ONNX model targets CPU kernels
+            use_cuda = torch.cuda.is_available() and not self.quantize
             self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
-            self.model = AutoModelForSequenceClassification.from_pretrained(self.model_name)
+            if self.quantize:
+                self.model = self._load_quantized_model()
+            else:
+                self.model = AutoModelForSequenceClassification.from_pretrained(
+                    self.model_name,
+                    torch_dtype=torch.float16 if use_cuda else torch.float32
+                )
+                self.model.eval()
+                if self.compile_model:
+                    # Compile in place so the pipeline still sees a transformers model
+                    self.model.compile(mode="reduce-overhead")
             self.classifier = pipeline(
                 "sentiment-analysis",
                 model=self.model,
-                tokenizer=self.tokenizer
+                tokenizer=self.tokenizer,
+                device=0 if use_cuda else -1
             )
+            if self.compile_model and not self.quantize:
+                # Trigger compilation now rather than on the first real call
+                with torch.inference_mode():
+                    self.classifier(["warm up", "warm up the compiled model"], batch_size=2)
         except Exception as e:
             raise RuntimeError(f"Failed to initialize local model: {str(e)}")
     
+    def _load_quantized_model(self):
+        """
+        Load the dynamically int8-quantized ONNX model, exporting and
+        quantizing it on first use.
+        """
+        try:
+            from optimum.onnxruntime import ORTModelForSequenceClassification, ORTQuantizer
+            from optimum.onnxruntime.configuration import AutoQuantizationConfig
+        except ImportError:
+            raise ImportError("quantize=True requires optimum[onnxruntime] to be installed")
+        
+        quantized_file = "model_quantized.onnx"
+        if not os.path.exists(os.path.join(self.quantized_model_dir, quantized_file)):
+            onnx_model = ORTModelForSequenceClassification.from_pretrained(
+                self.model_name,
+                export=True
+            )
+            quantizer = ORTQuantizer.from_pretrained(onnx_model)
+            quantization_config = AutoQuantizationConfig.avx512_vnni(
+                is_static=False,
+                per_channel=False
+            )
+            quantizer.quantize(
+                save_dir=self.quantized_model_dir,
+                quantization_config=quantization_config
+            )
+        
+        return ORTModelForSequenceClassification.from_pretrained(
+            self.quantized_model_dir,
+            file_name=quantized_file
+        )
+    
     def _validate_api_token(self) -> None:
         """Validate the Hugging Face API token"""
         self.hf_token = os.getenv("HF_TOKEN")
@@ -54,13 +120,13 @@ class SentimentAnalyzer:
         self.api_url = f"https://api-inference.huggingface.co/models/{self.model_name}"
         self.headers = {"Authorization": f"Bearer {self.hf_token}"}
     
-    def _call_api(self, text: str) -> Dict:
+    def _call_api(self, inputs: Union[str, List[str]]) -> Union[Dict, List]:
         """Make API call to Hugging Face inference endpoint"""
         try:
             response = requests.post(
                 self.api_url,
                 headers=self.headers,
-                json={"inputs": text}
+                json={"inputs": inputs}
             )
             response.raise_for_status()
             return response.json()
@@ -108,21 +174,41 @@ class SentimentAnalyzer:
             # API returns different format, we take the first result
             result = api_result[0] if isinstance(api_result, list) else api_result
         else:
-            result = self.classifier(text)[0]
+            with torch.inference_mode():
+                result = self.classifier(text, truncation=True)[0]
         
         return self._classify_sentiment(result)
     
-    def batch_analyze(self, texts: list) -> list:
+    def batch_analyze(self, texts: list, batch_size: int = 64) -> list:
         """
         Analyze sentiment for multiple texts.
         
+        Texts are sent through the model in mini-batches (or in a single
+        API request) rather than one call per text.
+        
         Args:
             texts: List of texts to analyze
+            batch_size: Number of texts per forward pass (local model only)
             
         Returns:
             List of sentiment analysis results
         """
         if not isinstance(texts, list):
             raise ValueError("Input must be a list of strings")
-            
-        return [self.analyze(text) for text in texts]
\ No newline at end of file
+        if not all(text and isinstance(text, str) for text in texts):
+            raise ValueError("Input texts must be non-empty strings")
+        if not texts:
+            return []
+        
+        if self.use_api:
+            api_results = self._call_api(texts)
+            # API returns the labels for each input, best label first
+            results = [
+                item[0] if isinstance(item, list) else item
+                for item in api_results
+            ]
+        else:
+            with torch.inference_mode():
+                results = self.classifier(texts, batch_size=batch_size, truncation=True)
+        
+        return [self._classify_sentiment(result) for result in results]
\ No newline at end of file
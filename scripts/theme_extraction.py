@@ -1,123 +1,452 @@
+import asyncio
+import functools
+import string
+import sys
+from types import MappingProxyType
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
 import spacy
-from sklearn.feature_extraction.text import TfidfVectorizer
-from typing import List, Dict, Optional
+from joblib import Parallel, delayed
+from spacy.attrs import IS_PUNCT, IS_SPACE, IS_STOP, LEMMA, LENGTH
+from spacy.lang.en.stop_words import STOP_WORDS
+from spacy.language import Language
+from sklearn.feature_extraction.text import CountVectorizer, HashingVectorizer, TfidfTransformer
+from scipy.sparse import csr_matrix
+from typing import List, Dict, Optional, Sequence, Tuple, Union
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Shared by the spaCy-free preprocessing path
+_STOP_WORDS = frozenset(STOP_WORDS)
+_PUNCT_TO_SPACE = str.maketrans(string.punctuation, " " * len(string.punctuation))
+
+# Columns read by ReviewThematicAnalyzer._doc_to_text
+_TOKEN_FILTER_ATTRS = [LEMMA, IS_STOP, IS_PUNCT, IS_SPACE, LENGTH]
+
+# Lemma hash -> interned lemma string. spaCy hashes strings the same way in
+# every vocab, so one cache serves every pipeline.
+_LEMMA_CACHE: Dict[int, str] = {}
+
+# Loaded spaCy pipelines, keyed by (model name, disabled components)
+_NLP_CACHE: Dict[Tuple[str, Tuple[str, ...]], Language] = {}
+
+
+def _get_nlp(name: str = "en_core_web_sm", disable: Tuple[str, ...] = ("parser", "ner")) -> Language:
+    """Load a spaCy pipeline once per process and share it between analyzers"""
+    key = (name, tuple(disable))
+    if key not in _NLP_CACHE:
+        _NLP_CACHE[key] = spacy.load(name, disable=list(disable))
+    return _NLP_CACHE[key]
+
+
+class _ThemeMatcher:
+    """
+    Compiled theme rules. A keyword only matches whole tokens of the
+    preprocessed (space-separated) text, so "pin" no longer hits "opinion";
+    multi-word keywords match consecutive tokens. When several themes match,
+    the one listed first in the rules wins.
+    
+    With pyahocorasick installed, strings are matched against one automaton
+    holding every keyword, padded with spaces so matches stop at token
+    boundaries; whitespace is normalized first so the result equals matching
+    text.split(). Token sequences (and strings without pyahocorasick) are
+    intersected with per-theme frozensets of tokens and token tuples.
+    """
+    __slots__ = ("themes", "categories", "other_code", "token_sets", "phrase_sets", "phrase_lengths", "automaton")
+    
+    def __init__(self, theme_rules: Dict[str, List[str]]):
+        self.themes = list(theme_rules)
+        # Theme codes index into categories; "Other" comes last unless the rules name it
+        self.categories = self.themes if "Other" in self.themes else self.themes + ["Other"]
+        self.other_code = self.categories.index("Other")
+        keyword_tokens = [
+            [tuple(keyword.split()) for keyword in keywords if keyword.strip()]
+            for keywords in theme_rules.values()
+        ]
+        self.token_sets = [
+            frozenset(tokens[0] for tokens in theme if len(tokens) == 1)
+            for theme in keyword_tokens
+        ]
+        self.phrase_sets = [
+            frozenset(tokens for tokens in theme if len(tokens) > 1)
+            for theme in keyword_tokens
+        ]
+        self.phrase_lengths = sorted({len(phrase) for phrases in self.phrase_sets for phrase in phrases})
+        self.automaton = self._build_automaton(self.themes, keyword_tokens)
+    
+    @staticmethod
+    def _build_automaton(themes: List[str], keyword_tokens: List[List[tuple]]):
+        """
+        Each keyword maps to (priority, theme) for the first theme that lists
+        it, with priority the theme's index in the rules, so the lowest
+        priority found in a text is the theme the rule order would pick.
+        Returns None when pyahocorasick is not installed.
+        """
+        if ahocorasick is None:
+            return None
+        automaton = ahocorasick.Automaton()
+        for priority, theme in enumerate(keyword_tokens):
+            for tokens in theme:
+                key = " " + " ".join(tokens) + " "
+                if key not in automaton:
+                    automaton.add_word(key, (priority, themes[priority]))
+        automaton.make_automaton()
+        return automaton
+    
+    def match(self, text: str) -> str:
+        """Theme of a single preprocessed text, or "Other" """
+        return self.categories[self.match_code(text)]
+    
+    def match_code(self, text: str) -> int:
+        """Index into categories of the theme of a single preprocessed text"""
+        if self.automaton is not None:
+            # Collapse tabs/newlines to single spaces so keywords next to them
+            # still sit between the padding spaces, as with text.split()
+            padded = " " + " ".join(text.split()) + " "
+            # One pass over the text finds every keyword; the earliest theme
+            # wins, and nothing can beat the first theme once it is found
+            best = len(self.themes)
+            for _, (priority, _theme) in self.automaton.iter(padded):
+                if priority < best:
+                    best = priority
+                    if best == 0:
+                        break
+            return self.other_code if best == len(self.themes) else best
+        return self.match_token_code(text.split())
+    
+    def match_token_code(self, tokens: Sequence[str]) -> int:
+        """match_code for a text that is already split into tokens"""
+        token_set = frozenset(tokens)
+        # n-grams are only built once a theme with phrase keywords needs them
+        ngram_sets = None
+        for code, (token_keywords, phrase_keywords) in enumerate(zip(self.token_sets, self.phrase_sets)):
+            if not token_set.isdisjoint(token_keywords):
+                return code
+            if phrase_keywords:
+                if ngram_sets is None:
+                    ngram_sets = [
+                        frozenset(zip(*(tokens[i:] for i in range(n))))
+                        for n in self.phrase_lengths
+                    ]
+                if any(not ngrams.isdisjoint(phrase_keywords) for ngrams in ngram_sets):
+                    return code
+        return self.other_code
+    
+    def match_codes(self, texts: np.ndarray) -> np.ndarray:
+        """
+        Theme codes of every text in an object array. Kept off the analyzer so
+        joblib workers only receive the compiled rules, not the spaCy pipeline.
+        """
+        return np.fromiter(
+            (self.match_code(text) for text in texts),
+            dtype=np.int16,
+            count=len(texts)
+        )
+    
+    def match_token_codes(self, token_lists: np.ndarray) -> np.ndarray:
+        """match_codes for an object array of token sequences"""
+        return np.fromiter(
+            (self.match_token_code(tokens) for tokens in token_lists),
+            dtype=np.int16,
+            count=len(token_lists)
+        )
+    
+    def to_categorical(self, codes: np.ndarray) -> pd.Categorical:
+        """Theme labels for codes, stored as a Categorical"""
+        return pd.Categorical.from_codes(codes, categories=self.categories)
+
+
+# Theme rules for preprocessed text (lemmatized, lowercase). Read-only and
+# shared by every analyzer built without custom rules.
+_DEFAULT_THEME_RULES = MappingProxyType({
+    # Core functionality (all lemmatized forms)
+    'account_access': (
+        'login', 'sign in', 'authenticate', 'biometric', 'face', 'touch',
+        'password', 'pin', '2fa', 'two factor', 'verify', 'lock out',
+        'session', 'timeout', 'account', 'recover', 'access', 'deny'
+    ),
+    
+    'app_performance': (
+        'crash', 'freeze', 'hang', 'lag', 'slow', 'perform', "good",
+        "fast", "quick", "response", "smooth", "efficient",
+        'bug', 'glitch', 'error', 'respond', 'unstable', 'load',
+        'refresh', 'restart', 'close', 'memory', 'storage', "nice", 
+        "great", "excellent", "awesome", "perfect", "love", "like"
+        
+    ),
+    
+    'transaction': (
+        'transfer', 'send', 'money', 'receive', 'payment', 'pay',
+        'bill', 'transaction', 'fail', 'decline', 'pending', 'delay',
+        'instant', 'process', 'limit', 'amount', 'recipient',
+        'schedule', 'recur', 'cancel', 'reverse', 'history'
+    ),
+    
+    # User experience
+    'ui_ux': (
+        'interface', 'design', 'layout', 'navigate', 'menu',
+        'button', 'icon', 'display', 'read', 'intuitive',
+        'user friendly', 'complicate', 'confuse', 'modern', 'clutter'
+    ),
+    
+    'security': (
+        'secure', 'privacy', 'data', 'protect', 'encrypt',
+        'fraud', 'scam', 'phish', 'hack', 'breach', 'leak',
+        'permission', 'consent', 'track', 'biometric', 'authenticate'
+    ),
+    
+    # Service aspects
+    'customer_support': (
+        'support', 'help', 'contact', 'assist', 'service',
+        'respond', 'representative', 'wait', 'call', 'resolve',
+        'email', 'chat', 'phone', 'escalate', 'complain'
+    ),
+    
+    'notification': (
+        'notify', 'alert', 'remind', 'message', 'inbox',
+        'email', 'sms', 'push', 'sound', 'vibrate', 'frequent',
+        'customize', 'turn off', 'mute', 'promo', 'market'
+    ),
+    
+    # Account management
+    'account_management': (
+        'profile', 'set', 'prefer', 'personal', 'inform',
+        'update', 'change', 'verify', 'document', 'id', 'address',
+        'close account', 'delete', 'deactivate', 'reactivate'
+    ),
+    
+    # Financial features
+    'financial_tools': (
+        'budget', 'spend', 'analyze', 'report', 'insight', 'trend',
+        'save', 'goal', 'plan', 'forecast', 'category', 'tag',
+        'receipt', 'scan', 'export', 'csv', 'excel', 'pdf'
+    ),
+    
+    # Feature requests
+    'feature_request': (
+        'suggest', 'recommend', 'wish', 'want', 'need',
+        'should', 'could', 'improve', 'enhance', 'add',
+        'include', 'miss', 'future', 'roadmap', 'vote', 'request'
+    ),
+    
+    # Integrations
+    'integration': (
+        'integrate', 'connect', 'link', 'partner', 'external',
+        'google pay', 'apple pay', 'paypal', 'venmo', 'zelle',
+        'plaid', 'quickbook', 'mint', 'other bank'
+    )
+})
+
+# Compiled once at import time
+_DEFAULT_THEME_MATCHER = _ThemeMatcher(_DEFAULT_THEME_RULES)
+
+# Columns written by ReviewThematicAnalyzer.save_results
+_DEFAULT_SAVE_COLUMNS = (
+    "review_id",
+    "app_id",
+    "app_name",
+    "rating",
+    "review_text",
+    "sentiment_label",
+    "sentiment_score",
+    "theme"
+)
+
 
 class ReviewThematicAnalyzer:
-    def __init__(self, theme_rules: Optional[Dict[str, List[str]]] = None):
-        """Initialize the analyzer with optional custom theme rules"""
-        self.nlp = spacy.load("en_core_web_sm")
-        self.theme_rules = theme_rules or self._get_default_theme_rules()
-        self.tfidf_vectorizer = None
+    def __init__(
+        self,
+        theme_rules: Optional[Dict[str, List[str]]] = None,
+        lemma_lookup: Optional[Dict[str, str]] = None,
+        cache_size: int = 100_000,
+        short_text_max_tokens: int = 3
+    ):
+        """
+        Initialize the analyzer with optional custom theme rules.
+        lemma_lookup maps word forms to lemmas for preprocess_fast
+        (e.g. the English lemma_lookup table from spacy-lookups-data).
+        cache_size bounds the per-instance LRU cache of preprocess results.
+        When a lemma_lookup is given, texts of at most short_text_max_tokens
+        words skip spaCy and go through preprocess_fast (0 sends everything
+        through spaCy). Without one they always use spaCy, since the theme
+        rules are written as lemmas.
+        """
+        # Preprocessing only needs lemmas and token flags, so skip the two
+        # most expensive components; extract_keywords_spacy uses nlp_full
+        self.nlp = _get_nlp()
+        # Per-instance cache: repeated short reviews ("good app") skip spaCy
+        self._preprocess_cached = functools.lru_cache(maxsize=cache_size)(self._preprocess)
+        self.theme_rules = theme_rules or _DEFAULT_THEME_RULES
+        self.lemma_lookup = lemma_lookup or {}
+        self.short_text_max_tokens = short_text_max_tokens
+        self._theme_matcher = _ThemeMatcher(theme_rules) if theme_rules else _DEFAULT_THEME_MATCHER
+        self.keyword_vectorizer = None
         self.keywords = None
         
     @staticmethod
-    def _get_default_theme_rules() -> Dict[str, List[str]]:
-        """Optimized theme rules for preprocessed text (lemmatized, lowercase)"""
-        return {
-            # Core functionality (all lemmatized forms)
-            'account_access': [
-                'login', 'sign in', 'authenticate', 'biometric', 'face', 'touch',
-                'password', 'pin', '2fa', 'two factor', 'verify', 'lock out',
-                'session', 'timeout', 'account', 'recover', 'access', 'deny'
-            ],
-            
-            'app_performance': [
-                'crash', 'freeze', 'hang', 'lag', 'slow', 'perform', "good",
-                "fast", "quick", "response", "smooth", "efficient",
-                'bug', 'glitch', 'error', 'respond', 'unstable', 'load',
-                'refresh', 'restart', 'close', 'memory', 'storage', "nice", 
-                "great", "excellent", "awesome", "perfect", "love", "like"
-                
-            ],
-            
-            'transaction': [
-                'transfer', 'send', 'money', 'receive', 'payment', 'pay',
-                'bill', 'transaction', 'fail', 'decline', 'pending', 'delay',
-                'instant', 'process', 'limit', 'amount', 'recipient',
-                'schedule', 'recur', 'cancel', 'reverse', 'history'
-            ],
-            
-            # User experience
-            'ui_ux': [
-                'interface', 'design', 'layout', 'navigate', 'menu',
-                'button', 'icon', 'display', 'read', 'intuitive',
-                'user friendly', 'complicate', 'confuse', 'modern', 'clutter'
-            ],
-            
-            'security': [
-                'secure', 'privacy', 'data', 'protect', 'encrypt',
-                'fraud', 'scam', 'phish', 'hack', 'breach', 'leak',
-                'permission', 'consent', 'track', 'biometric', 'authenticate'
-            ],
-            
-            # Service aspects
-            'customer_support': [
-                'support', 'help', 'contact', 'assist', 'service',
-                'respond', 'representative', 'wait', 'call', 'resolve',
-                'email', 'chat', 'phone', 'escalate', 'complain'
-            ],
-            
-            'notification': [
-                'notify', 'alert', 'remind', 'message', 'inbox',
-                'email', 'sms', 'push', 'sound', 'vibrate', 'frequent',
-                'customize', 'turn off', 'mute', 'promo', 'market'
-            ],
-            
-            # Account management
-            'account_management': [
-                'profile', 'set', 'prefer', 'personal', 'inform',
-                'update', 'change', 'verify', 'document', 'id', 'address',
-                'close account', 'delete', 'deactivate', 'reactivate'
-            ],
-            
-            # Financial features
-            'financial_tools': [
-                'budget', 'spend', 'analyze', 'report', 'insight', 'trend',
-                'save', 'goal', 'plan', 'forecast', 'category', 'tag',
-                'receipt', 'scan', 'export', 'csv', 'excel', 'pdf'
-            ],
-            
-            # Feature requests
-            'feature_request': [
-                'suggest', 'recommend', 'wish', 'want', 'need',
-                'should', 'could', 'improve', 'enhance', 'add',
-                'include', 'miss', 'future', 'roadmap', 'vote', 'request'
-            ],
-            
-            # Integrations
-            'integration': [
-                'integrate', 'connect', 'link', 'partner', 'external',
-                'google pay', 'apple pay', 'paypal', 'venmo', 'zelle',
-                'plaid', 'quickbook', 'mint', 'other bank'
-            ]
-        }
+    def _doc_to_tokens(doc) -> Tuple[str, ...]:
+        """Lemmas of the content tokens of a parsed doc"""
+        # Filter on the doc's attribute array instead of building Token objects
+        attrs = doc.to_array(_TOKEN_FILTER_ATTRS)
+        keep = (attrs[:, 1] == 0) & (attrs[:, 2] == 0) & (attrs[:, 3] == 0) & (attrs[:, 4] > 2)
+        strings = doc.vocab.strings
+        lemmas = []
+        for lemma_hash in attrs[keep, 0].tolist():
+            lemma = _LEMMA_CACHE.get(lemma_hash)
+            if lemma is None:
+                lemma = _LEMMA_CACHE[lemma_hash] = sys.intern(strings[lemma_hash])
+            lemmas.append(lemma)
+        return tuple(lemmas)
+    
+    @classmethod
+    def _doc_to_text(cls, doc) -> str:
+        """Join the lemmas of the content tokens of a parsed doc"""
+        return " ".join(cls._doc_to_tokens(doc))
+    
+    def _is_short(self, text: str) -> bool:
+        """
+        Whether text is short enough to skip the spaCy pipeline. Only with a
+        lemma_lookup: without it preprocess_fast would leave words unlemmatized
+        """
+        return bool(self.lemma_lookup) and len(text.split()) <= self.short_text_max_tokens
+    
+    def _preprocess(self, text: str) -> str:
+        text = text.lower().strip()
+        if self._is_short(text):
+            return self.preprocess_fast(text)
+        doc = self.nlp(text)  
+        return self._doc_to_text(doc)
     
     def preprocess(self, text: str) -> str:
-        """Clean and lemmatize text"""
-        doc = self.nlp(text.lower().strip())  
-        tokens = [
-            token.lemma_ for token in doc 
-            if not token.is_stop 
-            and not token.is_punct 
-            and not token.is_space
-            and len(token) > 2  
-        ]
-        return " ".join(tokens)
+        """Clean and lemmatize text (results are cached per raw text)"""
+        return self._preprocess_cached(text)
+    
+    def _tokenize_unique(
+        self,
+        texts: Union[List[str], pd.Series, np.ndarray],
+        batch_size: int,
+        n_process: int
+    ) -> Tuple[List[str], Dict[str, Tuple[str, ...]]]:
+        """
+        Lowercase texts and lemmatize each distinct one, short texts without
+        spaCy and the rest in one streamed nlp.pipe call.
+        Returns the lowercased texts and a map from each to its tokens.
+        """
+        texts = [text.lower().strip() for text in texts]
+        
+        tokens = {}
+        long_texts = []
+        for text in dict.fromkeys(texts):
+            if self._is_short(text):
+                tokens[text] = self.preprocess_fast_tokens(text)
+            else:
+                long_texts.append(text)
+        
+        docs = self.nlp.pipe(
+            long_texts,
+            batch_size=batch_size,
+            n_process=n_process
+        )
+        tokens.update(
+            (text, self._doc_to_tokens(doc)) for text, doc in zip(long_texts, docs)
+        )
+        return texts, tokens
+    
+    def preprocess_texts(
+        self,
+        texts: Union[List[str], pd.Series, np.ndarray],
+        batch_size: int = 1000,
+        n_process: int = 1
+    ) -> np.ndarray:
+        """
+        Clean and lemmatize many texts in one streamed nlp.pipe call.
+        Duplicate texts are only processed once, and short texts skip spaCy.
+        Pass n_process=-1 to spread the work over all CPU cores.
+        Returns an object array aligned with texts.
+        """
+        texts, tokens = self._tokenize_unique(texts, batch_size, n_process)
+        processed = {text: " ".join(text_tokens) for text, text_tokens in tokens.items()}
+        return np.fromiter(
+            (processed[text] for text in texts),
+            dtype=object,
+            count=len(texts)
+        )
+    
+    def preprocess_tokens(
+        self,
+        texts: Union[List[str], pd.Series, np.ndarray],
+        batch_size: int = 1000,
+        n_process: int = 1
+    ) -> np.ndarray:
+        """
+        preprocess_texts without the final join: returns an object array of
+        token tuples aligned with texts. Duplicate texts share one tuple.
+        """
+        texts, tokens = self._tokenize_unique(texts, batch_size, n_process)
+        processed = np.empty(len(texts), dtype=object)
+        processed[:] = [tokens[text] for text in texts]
+        return processed
+    
+    def preprocess_fast(self, text: str) -> str:
+        """
+        Clean text without running spaCy: lowercase, split on whitespace and
+        punctuation, drop stopwords and short tokens, and lemmatize through
+        the lemma_lookup table.
+        """
+        return " ".join(self.preprocess_fast_tokens(text))
+    
+    def preprocess_fast_tokens(self, text: str) -> Tuple[str, ...]:
+        """preprocess_fast without the final join"""
+        lookup = self.lemma_lookup
+        return tuple(
+            lookup.get(token, token)
+            for token in text.lower().translate(_PUNCT_TO_SPACE).split()
+            if len(token) > 2 and token not in _STOP_WORDS
+        )
     
     def extract_keywords_tfidf(self, texts: List[str], max_features: int = 100) -> List[str]:
-        """Extract keywords using TF-IDF"""
-        self.tfidf_vectorizer = TfidfVectorizer(
+        """
+        Extract the top unigram/bigram keywords of the TF-IDF vocabulary.
+        max_features ranks terms by corpus frequency, so counting is enough;
+        the TF-IDF weighting itself is skipped (see tfidf_matrix).
+        """
+        self.keyword_vectorizer = CountVectorizer(
             ngram_range=(1, 2),
             max_features=max_features
         )
-        tfidf_matrix = self.tfidf_vectorizer.fit_transform(texts)
-        self.keywords = self.tfidf_vectorizer.get_feature_names_out()
+        self.keyword_vectorizer.fit(texts)
+        self.keywords = self.keyword_vectorizer.get_feature_names_out()
         return self.keywords
     
+    def tfidf_matrix(self, texts: List[str], n_features: int = 2 ** 18) -> csr_matrix:
+        """
+        Build a TF-IDF matrix over hashed unigrams/bigrams, without
+        holding a vocabulary in memory
+        """
+        hashing_vectorizer = HashingVectorizer(
+            ngram_range=(1, 2),
+            n_features=n_features,
+            alternate_sign=False,
+            norm=None
+        )
+        counts = hashing_vectorizer.transform(texts)
+        return TfidfTransformer().fit_transform(counts)
+    
+    @property
+    def nlp_full(self):
+        """Full spaCy pipeline (with parser), loaded on first use"""
+        return _get_nlp(disable=())
+    
     def extract_keywords_spacy(self, text: str) -> List[str]:
         """Extract keywords using spaCy's linguistic features"""
-        doc = self.nlp(text)
+        # noun_chunks needs the dependency parser
+        doc = self.nlp_full(text)
         return [chunk.text for chunk in doc.noun_chunks] + [
             token.lemma_ for token in doc 
             if token.pos_ in ["NOUN", "ADJ"]
@@ -125,54 +454,162 @@ class ReviewThematicAnalyzer:
     
     def assign_theme(self, text: str) -> str:
         """Assign theme based on keyword matching"""
-        for theme, keywords in self.theme_rules.items():
-            if any(keyword in text for keyword in keywords):
-                return theme
-        return "Other"
+        return self._theme_matcher.match(text)
+    
+    def assign_themes(self, texts: Union[pd.Series, np.ndarray], n_jobs: int = 1, chunk_size: int = 20_000) -> pd.Series:
+        """
+        Assign a theme to every text in a Series, matching keywords as whole
+        tokens (see _ThemeMatcher). Returns a categorical Series.
+        With n_jobs != 1 the Series is split into chunks of about chunk_size
+        rows that are matched in joblib (loky) worker processes.
+        """
+        index = texts.index if isinstance(texts, pd.Series) else None
+        codes = self._assign_theme_codes(np.asarray(texts, dtype=object), n_jobs, chunk_size)
+        return pd.Series(self._theme_matcher.to_categorical(codes), index=index)
+    
+    def _assign_theme_codes(
+        self,
+        texts: np.ndarray,
+        n_jobs: int = 1,
+        chunk_size: int = 20_000,
+        tokenized: bool = False
+    ) -> np.ndarray:
+        """
+        Theme codes for a plain object array, without pandas boxing.
+        With tokenized=True the array holds token sequences instead of texts.
+        """
+        match_codes = self._theme_matcher.match_token_codes if tokenized else self._theme_matcher.match_codes
+        if n_jobs == 1 or len(texts) <= chunk_size:
+            return match_codes(texts)
+        
+        n_chunks = -(-len(texts) // chunk_size)
+        results = Parallel(n_jobs=n_jobs, backend="loky")(
+            delayed(match_codes)(chunk)
+            for chunk in np.array_split(texts, n_chunks)
+        )
+        return np.concatenate(results)
     
     def analyze_reviews(
         self, 
         df: pd.DataFrame, 
         text_column: str = "review_text",
         sentiment_column: str = "sentiment_label",
-        score_column: str = "sentiment_score"
+        score_column: str = "sentiment_score",
+        use_spacy: bool = True,
+        batch_size: int = 1000,
+        n_process: int = 1,
+        extract_keywords: bool = False,
+        n_jobs: int = 1,
+        keep_processed_text: bool = True
     ) -> pd.DataFrame:
         """
         Process dataframe and add thematic analysis columns
-        Returns dataframe with added columns: processed_text, theme
+        Returns dataframe with added columns: processed_tokens (tuples of
+        lemmas), processed_text (the joined tokens) and theme (categorical)
+        Set use_spacy=False to preprocess with preprocess_fast instead of spaCy;
+        batch_size and n_process are passed to nlp.pipe.
+        Set extract_keywords=True to also fill self.keywords via TF-IDF
+        (theme assignment does not use them); n_jobs is passed to assign_themes.
+        Set keep_processed_text=False to skip building processed_text.
         """
-        # Preprocess text
-        df["processed_text"] = df[text_column].apply(self.preprocess)
+        # Work on plain object arrays and attach the columns once at the end
+        texts = df[text_column].to_numpy(dtype=object)
         
-        # Extract keywords (TF-IDF approach)
-        self.extract_keywords_tfidf(df["processed_text"].tolist())
+        # Preprocess text into tokens; themes are matched on them directly
+        if use_spacy:
+            tokens = self.preprocess_tokens(
+                texts,
+                batch_size=batch_size,
+                n_process=n_process
+            )
+        else:
+            tokens = np.empty(len(texts), dtype=object)
+            tokens[:] = [self.preprocess_fast_tokens(text) for text in texts]
+        
+        processed = None
+        if keep_processed_text or extract_keywords:
+            processed = np.fromiter(
+                (" ".join(text_tokens) for text_tokens in tokens),
+                dtype=object,
+                count=len(tokens)
+            )
+        
+        # Extract keywords (TF-IDF approach), only on request
+        if extract_keywords:
+            self.extract_keywords_tfidf(processed.tolist())
         
         # Assign themes
-        df["theme"] = df["processed_text"].apply(self.assign_theme)
+        theme_codes = self._assign_theme_codes(tokens, n_jobs=n_jobs, tokenized=True)
         
+        df["processed_tokens"] = tokens
+        if keep_processed_text:
+            df["processed_text"] = processed
+        df["theme"] = self._theme_matcher.to_categorical(theme_codes)
         return df
     
+    async def analyze_reviews_async(self, df: pd.DataFrame, **kwargs) -> pd.DataFrame:
+        """
+        analyze_reviews for async callers: runs it in a worker thread so the
+        event loop keeps serving other tasks while spaCy works.
+        Takes the same keyword arguments as analyze_reviews.
+        """
+        return await asyncio.to_thread(self.analyze_reviews, df, **kwargs)
+    
     def save_results(
         self, 
         df: pd.DataFrame, 
         output_path: str,
-        columns: List[str] = [
-            "review_id",
-            "app_id", 
-            "app_name", 
-            "rating", 
-            "review_text", 
-            "sentiment_label", 
-            "sentiment_score",
-            "theme"
-        ]
+        columns: Sequence[str] = _DEFAULT_SAVE_COLUMNS,
+        format: str = "csv"
     ) -> None:
-        """Save analysis results to CSV"""
-        df[columns].to_csv(output_path, index=False)
+        """
+        Save analysis results to CSV, or to zstd-compressed Parquet with
+        format="parquet". Parquet is written by pyarrow. CSV goes through
+        pyarrow's writer when every column is a string, number or categorical,
+        and through DataFrame.to_csv otherwise (mixed-type objects, token
+        lists, timestamps, booleans) so those keep pandas' formatting.
+        """
+        frame = df.loc[:, list(columns)]
+        if format == "csv":
+            table = self._csv_arrow_table(frame)
+            if table is None:
+                frame.to_csv(output_path, index=False)
+            else:
+                pacsv.write_csv(table, output_path)
+        elif format == "parquet":
+            pq.write_table(pa.Table.from_pandas(frame, preserve_index=False), output_path, compression="zstd")
+        else:
+            raise ValueError(f"Unsupported format: {format!r} (expected 'csv' or 'parquet')")
+    
+    @staticmethod
+    def _csv_arrow_table(frame: pd.DataFrame) -> Optional[pa.Table]:
+        """
+        frame as an Arrow table if every column is one pyarrow's CSV writer
+        renders so that it reads back like to_csv output, else None
+        """
+        try:
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+            return None
+        for field in table.schema:
+            field_type = field.type
+            if pa.types.is_dictionary(field_type):
+                field_type = field_type.value_type
+            if not (
+                pa.types.is_string(field_type)
+                or pa.types.is_large_string(field_type)
+                or pa.types.is_integer(field_type)
+                or pa.types.is_floating(field_type)
+                or pa.types.is_null(field_type)
+            ):
+                return None
+        return table
     
     def get_theme_distribution(self, df: pd.DataFrame) -> pd.DataFrame:
         """Return percentage distribution of themes"""
-        theme_counts = df["theme"].value_counts(normalize=True) * 100
-        return theme_counts.reset_index().rename(
-            columns={"index": "theme", "theme": "percentage"}
-        )
\ No newline at end of file
+        theme_counts = df["theme"].value_counts(normalize=True).mul(100)
+        # A categorical column also lists themes that never occur; return
+        # plain labels so plots don't draw empty slots for them
+        theme_counts = theme_counts[theme_counts > 0]
+        theme_counts.index = theme_counts.index.astype(str)
+        return theme_counts.rename_axis("theme").reset_index(name="percentage")
\ No newline at end of file